@@ -0,0 +1,98 @@
+"""
+Measure how long logerror() blocks the calling thread during an error storm,
+with a deliberately slow loggerService writer, against calling the writer
+inline as the views used to.
+
+    python benchmarks/errorLogBenchmark.py [--errors 20000] [--threads 16] [--write-ms 5]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from utility import errorLogger
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def burst(log, errors, threads, sites):
+    """Call log() errors times spread over threads, return per-call latencies in ms."""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = errors // threads
+
+    def worker(worker_id):
+        local = []
+        for i in range(per_thread):
+            site = 'admin_customer/views.py/site%d' % ((worker_id + i) % sites)
+            started_at = time.perf_counter()
+            log(site, 'duplicate key value violates unique constraint')
+            local.append((time.perf_counter() - started_at) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def report(name, latencies, elapsed):
+    print('%-10s %8d %10.1f %10.3f %10.3f %10.3f %10.3f' % (
+        name, len(latencies), elapsed, percentile(latencies, 50), percentile(latencies, 99),
+        percentile(latencies, 99.9), max(latencies)
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--errors', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--sites', type=int, default=6)
+    parser.add_argument('--write-ms', type=float, default=5, help='simulated cost of one loggerService write')
+    parser.add_argument('--inline-errors', type=int, default=500, help='calls for the inline baseline')
+    args = parser.parse_args()
+
+    writes = []
+
+    def slow_write(site, message):
+        time.sleep(args.write_ms / 1000)
+        writes.append((site, message))
+
+    errorLogger.write_error = slow_write
+
+    print('%-10s %8s %10s %10s %10s %10s %10s' % ('mode', 'calls', 'total ms', 'p50 ms', 'p99 ms', 'p99.9 ms', 'max ms'))
+    started_at = time.perf_counter()
+    latencies = burst(slow_write, args.inline_errors, args.threads, args.sites)
+    report('inline', latencies, (time.perf_counter() - started_at) * 1000)
+
+    del writes[:]
+    started_at = time.perf_counter()
+    latencies = burst(errorLogger.logerror, args.errors, args.threads, args.sites)
+    report('buffered', latencies, (time.perf_counter() - started_at) * 1000)
+
+    errorLogger.pipeline.flush()
+    # the writer thread may still hold a batch until its flush deadline, and
+    # each site can produce an entry plus a rate-limit/overflow line
+    time.sleep(2 * errorLogger.pipeline.flush_interval + 3 * args.sites * args.write_ms / 1000)
+    print('\nbuffered run produced %d log write(s):' % len(writes))
+    for site, message in writes[:2 * args.sites]:
+        print('  %s: %s' % (site, message))
+
+
+if __name__ == '__main__':
+    main()
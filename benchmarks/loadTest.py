@@ -0,0 +1,249 @@
+"""
+Replay a mix of admin customer/note calls against a running instance at a
+target rate and report throughput, latency percentiles and error rates per
+endpoint.
+
+Start the app against a local database first, e.g.
+
+    REQUEST_PROFILE_DIR=/tmp/profiles python manage.py runserver --noreload
+
+then
+
+    python benchmarks/loadTest.py --base-url http://127.0.0.1:8000/ \\
+        --token <access-token> --rps 50 --duration 60 \\
+        --mix list=40,search=20,detail=15,create=5,update=5,note=15
+
+With RequestProfilingMiddleware installed, pass --profile to have the
+server dump a cProfile snapshot for a sample of the slow requests; the
+slowest ones are listed at the end of the report. Profiled requests run
+slower, so compare percentiles against a run without --profile.
+"""
+import argparse
+import json
+import random
+import string
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+ENDPOINTS = ('list', 'search', 'detail', 'create', 'update', 'note')
+DEFAULT_MIX = 'list=40,search=20,detail=15,create=5,update=5,note=15'
+SEARCH_KEYWORDS = ['nitesh', 'jangir', '98765', 'yopmail', 'llc', 'a']
+
+
+def random_text(length=8):
+    return ''.join(random.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def customer_payload(args):
+    return {
+        'first_name': random_text(),
+        'last_name': random_text(),
+        'gender': 'male',
+        'dob': '1990-01-01',
+        'marital_status': 'single',
+        'country_code': 1,
+        'ssn_itin': '',
+        'mobile': '9876543210',
+        'phone': '9876543210',
+        'email': 'loadtest-%s@yopmail.com' % random_text(12),
+        'profile_type': args.profile_type,
+        'company_name': '',
+        'mailing_address': 'load test street',
+        'mailing_country_id': args.country_id,
+        'mailing_state_id': args.state_id,
+        'mailing_city_id': args.city_id,
+        'mailing_zip_code': 12312,
+        'physical_address': 'load test street',
+        'physical_country_id': args.country_id,
+        'physical_state_id': args.state_id,
+        'physical_city_id': args.city_id,
+        'physical_zip_code': 12312,
+        'id_type': 'license',
+        'id_number': random_text(10).upper(),
+        'id_country': args.country_id,
+        'id_state': args.state_id,
+        'id_expire_date': '2030-01-01',
+        'id_status': 'valid',
+    }
+
+
+def build_request(name, args):
+    """Return (method, path, body) for one call of the given endpoint."""
+    customer_id = random.choice(args.customer_ids)
+    if name == 'list':
+        offset = random.randrange(0, args.max_offset + 1, args.page_limit)
+        return 'GET', 'v1/admin/customers?search_keyword=&page_limit=%d&page_offset=%d' % (args.page_limit, offset), None
+    if name == 'search':
+        return 'GET', 'v1/admin/customers?search_keyword=%s&page_limit=%d&page_offset=0' % (
+            random.choice(SEARCH_KEYWORDS), args.page_limit), None
+    if name == 'detail':
+        return 'GET', 'v1/admin/customers/%d' % customer_id, None
+    if name == 'create':
+        return 'POST', 'v1/admin/customers', customer_payload(args)
+    if name == 'update':
+        payload = customer_payload(args)
+        del payload['email']
+        return 'PUT', 'v1/admin/customers/%d' % customer_id, payload
+    if name == 'note':
+        return 'POST', args.note_path, {
+            'user_id': customer_id,
+            'user_note': 'load test note ' + random_text(),
+            'full_name': 'Load Test',
+            'role_id': args.role_id,
+        }
+    raise ValueError('unknown endpoint %r' % name)
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, weight = item.split('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError('unknown endpoint %r in mix, expected one of %s' % (name, ', '.join(ENDPOINTS)))
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+class Recorder:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, name, latency_ms, outcome, profile_file):
+        with self.lock:
+            self.samples.setdefault(name, []).append((latency_ms, outcome, profile_file))
+
+
+def send(name, args, recorder, scheduled_at):
+    method, path, body = build_request(name, args)
+    headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    if args.token:
+        headers['authorization'] = args.token
+    if args.profile:
+        headers['X-Load-Test-Profile'] = '1'
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(args.base_url + path, data=data, headers=headers, method=method)
+
+    outcome = 'error'
+    profile_file = None
+    try:
+        with urllib.request.urlopen(request, timeout=args.timeout) as response:
+            content = response.read()
+            profile_file = response.headers.get('X-Profile-File')
+            outcome = 'app_error' if is_app_error(content) else 'ok'
+    except urllib.error.HTTPError as error:
+        profile_file = error.headers.get('X-Profile-File')
+    except (urllib.error.URLError, OSError):
+        pass
+    # latency counts from when the request was due, not from when a worker
+    # picked it up, so time spent queued behind a saturated pool is included
+    recorder.add(name, (time.monotonic() - scheduled_at) * 1000, outcome, profile_file)
+
+
+def is_app_error(content):
+    # the views answer some failures (unknown user, existing email) with
+    # 200 and an "error" key instead of an error status
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return False
+    return isinstance(body, dict) and 'error' in body
+
+
+def run(args):
+    names, weights = list(args.mix), list(args.mix.values())
+    recorder = Recorder()
+    interval = 1.0 / args.rps
+    total = int(args.rps * args.duration)
+
+    futures = []
+    started_at = time.monotonic()
+    # open loop: requests are scheduled on the clock, not on completion,
+    # so a slow server shows up as latency instead of a lower request rate
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for i in range(total):
+            scheduled_at = started_at + i * interval
+            delay = scheduled_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(send, random.choices(names, weights)[0], args, recorder, scheduled_at))
+    elapsed = time.monotonic() - started_at
+    for future in futures:
+        # surface bugs in the harness itself instead of dropping samples
+        future.result()
+    return recorder, elapsed
+
+
+def report(recorder, elapsed, slowest, profile):
+    if profile:
+        print('note: --profile was on, sampled requests ran under cProfile and inflate the latencies\n')
+    print('%-8s %8s %9s %9s %9s %9s %8s %8s' % (
+        'endpoint', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors', 'app err'))
+    everything = []
+    for name in sorted(recorder.samples):
+        samples = recorder.samples[name]
+        latencies = [sample[0] for sample in samples]
+        # "errors" covers every failed call, "app err" the 200 + "error" subset
+        errors = sum(1 for sample in samples if sample[1] != 'ok')
+        app_errors = sum(1 for sample in samples if sample[1] == 'app_error')
+        everything.extend((sample[0], name, sample[2]) for sample in samples)
+        print('%-8s %8d %9.1f %9.1f %9.1f %9.1f %7.1f%% %7.1f%%' % (
+            name, len(samples), len(samples) / elapsed,
+            percentile(latencies, 50), percentile(latencies, 95), percentile(latencies, 99),
+            100.0 * errors / len(samples), 100.0 * app_errors / len(samples)
+        ))
+
+    print('\nslowest requests:')
+    for latency_ms, name, profile_file in sorted(everything, reverse=True)[:slowest]:
+        print('  %-8s %9.1f ms  %s' % (name, latency_ms, profile_file or '-'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000/')
+    parser.add_argument('--token', default='', help='access token sent in the authorization header')
+    parser.add_argument('--rps', type=float, default=20)
+    parser.add_argument('--duration', type=float, default=30, help='seconds')
+    parser.add_argument('--concurrency', type=int, default=64, help='max in-flight requests')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--mix', default=DEFAULT_MIX)
+    parser.add_argument('--customer-ids', default='1', help='comma separated ids used by detail/update/note')
+    parser.add_argument('--page-limit', type=int, default=20)
+    parser.add_argument('--max-offset', type=int, default=200)
+    parser.add_argument('--note-path', default='v1/admin/customers/notes/create')
+    parser.add_argument('--role-id', type=int, default=1)
+    parser.add_argument('--profile-type', default='individual')
+    parser.add_argument('--country-id', type=int, default=1)
+    parser.add_argument('--state-id', type=int, default=1)
+    parser.add_argument('--city-id', type=int, default=1)
+    parser.add_argument('--profile', action='store_true', help='ask the server for profile snapshots')
+    parser.add_argument('--slowest', type=int, default=10)
+    args = parser.parse_args()
+    try:
+        args.mix = parse_mix(args.mix)
+    except ValueError as error:
+        parser.error(str(error))
+    args.customer_ids = [int(customer_id) for customer_id in args.customer_ids.split(',')]
+    if not args.base_url.endswith('/'):
+        args.base_url += '/'
+
+    recorder, elapsed = run(args)
+    report(recorder, elapsed, args.slowest, args.profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare bytes on the wire and render time of the response renderers on a
+1k-row customer list page.
+
+    python benchmarks/renderBenchmark.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import gzip
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(USE_TZ=True, INSTALLED_APPS=['rest_framework'])
+    import django
+    django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from utility import responseRenderer
+from utility.responseRenderer import FastJSONRenderer, MessagePackRenderer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_page(rows):
+    # mirrors the Customers.get payload, plus raw datetime/uuid fields as
+    # they appear on export pages that skip serializer formatting
+    created_at = datetime(2020, 9, 8, 7, 33, 23, tzinfo=timezone.utc)
+    data = []
+    for i in range(rows):
+        data.append({
+            "user_id": i,
+            "uuid": uuid.uuid1(),
+            "email": "customer%d@yopmail.com" % i,
+            "user_type": {"type_id": 2, "name": "user"},
+            "customer_id": 6598718987 + i,
+            "first_name": "Nitesh",
+            "last_name": "Jangir",
+            "mobile_number": "9876543210",
+            "is_active": 1,
+            "created_at": created_at + timedelta(minutes=i),
+        })
+    return {'data': data, 'total_record': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    page = build_page(args.rows)
+    candidates = [('drf-json', JSONRenderer())]
+    if responseRenderer.orjson is not None:
+        candidates.append(('orjson', FastJSONRenderer()))
+    if responseRenderer.msgpack is not None:
+        candidates.append(('msgpack', MessagePackRenderer()))
+
+    print('%-10s %12s %10s %10s %10s' % ('renderer', 'ms/render', 'bytes', 'gzip', 'br'))
+    for name, renderer in candidates:
+        body = renderer.render(page, renderer.media_type, {})
+        seconds = timeit.timeit(lambda: renderer.render(page, renderer.media_type, {}), number=args.repeat)
+        gzip_size = len(gzip.compress(body, compresslevel=6))
+        br_size = len(brotli.compress(body, quality=5)) if brotli is not None else '-'
+        print('%-10s %12.3f %10d %10d %10s' % (
+            name, seconds * 1000 / args.repeat, len(body), gzip_size, br_size
+        ))
+
+
+if __name__ == '__main__':
+    main()
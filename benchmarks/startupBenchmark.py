@@ -0,0 +1,79 @@
+"""
+Measure worker cold-start cost: Django setup, import time of the views
+module, optional warm-up, then first and second request time per endpoint.
+Run it once with and once without --warmup to see what the post-fork hook
+saves; each run must be a fresh interpreter to be a real cold start.
+
+    DJANGO_SETTINGS_MODULE=argo_texas.settings \\
+        python benchmarks/startupBenchmark.py --token <access-token> [--warmup]
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DEFAULT_ENDPOINTS = [
+    'list=GET v1/admin/customers?search_keyword=&page_limit=20&page_offset=0',
+    'search=GET v1/admin/customers?search_keyword=a&page_limit=20&page_offset=0',
+    'detail=GET v1/admin/customers/1',
+    'notes=GET v1/admin/customers/notes?page_limit=20&page_offset=0',
+]
+
+
+def timed(func):
+    started_at = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started_at) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--views-module', default='admin_customer.views')
+    parser.add_argument('--token', default='', help='access token sent in the authorization header')
+    parser.add_argument('--warmup', action='store_true', help='run utility.startup.warm_up() before the first request')
+    parser.add_argument('--endpoint', action='append', dest='endpoints',
+                        help='name=METHOD path, may be repeated (default: list, search, detail, notes)')
+    args = parser.parse_args()
+
+    import django
+    _, setup_ms = timed(django.setup)
+    _, import_ms = timed(lambda: importlib.import_module(args.views_module))
+    print('%-12s %10.1f ms' % ('django.setup', setup_ms))
+    print('%-12s %10.1f ms' % ('import', import_ms))
+
+    if args.warmup:
+        from utility.startup import warm_up
+        timings, warmup_ms = timed(warm_up)
+        print('%-12s %10.1f ms  (%s)' % (
+            'warm-up', warmup_ms, ', '.join('%s=%.1f' % item for item in timings.items())
+        ))
+
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    # adds "testserver" to ALLOWED_HOSTS, otherwise every request is a 400
+    # DisallowedHost and the timings measure the host check, not the views
+    setup_test_environment()
+    client = Client(HTTP_AUTHORIZATION=args.token)
+
+    # the first request through the client also loads the middleware chain
+    # and the project's URLconf; pay that on a 404 so it isn't charged to
+    # whichever endpoint happens to be measured first
+    _, client_setup_ms = timed(lambda: client.get('/__startup_benchmark__/'))
+    print('%-12s %10.1f ms' % ('client setup', client_setup_ms))
+
+    print('\n%-10s %8s %12s %12s' % ('endpoint', 'status', 'first ms', 'second ms'))
+    for endpoint in args.endpoints or DEFAULT_ENDPOINTS:
+        name, request = endpoint.split('=', 1)
+        method, path = request.split(' ', 1)
+        send = getattr(client, method.lower())
+        response, first_ms = timed(lambda: send('/' + path))
+        _, second_ms = timed(lambda: send('/' + path))
+        print('%-10s %8d %12.1f %12.1f' % (name, response.status_code, first_ms, second_ms))
+
+
+if __name__ == '__main__':
+    main()
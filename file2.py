@@ -4,31 +4,134 @@ import uuid
 import random
 import string
 from datetime import datetime
-from cerberus import Validator
 from django.db.models import Q
 from django.db import transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from django.utils.decorators import method_decorator
 
 from config.messages import Messages
-from utility.argoCommon import ArgoCommon
-from utility.loggerService import logerror
+from utility.errorLogger import logerror
 from utility.rbacService import RbacService
-from utility.hashingUtility import hashingUtility
 from utility.authMiddleware import isAuthenticate
+from utility.responseRenderer import RENDERER_CLASSES
+from utility.startup import lazy_import, register_schema, register_serializer
 from argo_texas.settings import ArgoCommonConstants, EmailConstants
 from .serializers import UserSerializer, UserDetailSerializer , NoteSerialiser
 from user_auth.models import User, Cities, States, Countries, UserAddresses, Notes
 from django.db.models import Value as V
 from django.db.models.functions import Concat
 
+# heavy modules only needed by some views are imported on first use,
+# utility.startup.warm_up() loads them ahead of the first request
+Validator = lazy_import('cerberus', 'Validator')
+ArgoCommon = lazy_import('utility.argoCommon', 'ArgoCommon')
+hashingUtility = lazy_import('utility.hashingUtility', 'hashingUtility')
+
+register_serializer(UserSerializer)
+register_serializer(UserDetailSerializer)
+register_serializer(NoteSerialiser)
+
+CUSTOMER_LIST_SCHEMA = register_schema({
+    "search_keyword": {'type': 'string', 'required': True, 'empty': True},
+    "page_limit": {'type': 'integer', 'required': True, 'empty': False},
+    "page_offset": {'type': 'integer', 'required': True, 'empty': False}
+})
+
+CUSTOMER_CREATE_SCHEMA = register_schema({
+    "first_name": {'type': 'string', 'required': True, 'empty': False},
+    "last_name": {'type': 'string', 'required': True, 'empty': False},
+    "gender": {'type': 'string', 'required': True, 'empty': False, 'allowed': ArgoCommonConstants.GENDER},
+    "dob": {'type': 'date', 'required': True, 'empty': False},
+    "marital_status": {'type': 'string', 'required': True, 'empty': False,
+                       'allowed': ArgoCommonConstants.MARTIAL_STATUS},
+    "country_code": {'type': 'integer', 'required': True, 'empty': False},
+    "ssn_itin": {'type': 'string', 'required': True, 'empty': True},
+    "mobile": {'type': 'string', 'required': True, 'empty': False},
+    "phone": {'type': 'string', 'required': True, 'empty': False},
+    "email": {'type': 'string', 'required': True, 'empty': False},
+    "profile_type": {'type': 'string', 'required': True, 'empty': False,
+                     'allowed': ArgoCommonConstants.PROFILE_TYPES},
+    "company_name": {'type': 'string', 'required': True, 'empty': True},
+    "mailing_address": {'type': 'string', 'required': True, 'empty': False},
+    "mailing_country_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_state_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_city_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_address": {'type': 'string', 'required': True, 'empty': False},
+    "physical_country_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_state_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_city_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
+    "id_type": {'type': 'string', 'required': True, 'empty': False,
+                'allowed': ArgoCommonConstants.ID_TYPE},
+    "id_number": {'type': 'string', 'required': True, 'empty': False},
+    "id_country": {'type': 'integer', 'required': True, 'nullable': False},
+    "id_state": {'type': 'integer', 'required': True, 'nullable': True},
+    "id_expire_date": {'type': 'date', 'required': True, 'empty': False},
+    "id_status": {'type': 'string', 'required': True, 'empty': False,
+                  'allowed': ArgoCommonConstants.ID_STATUS}
+})
+
+CUSTOMER_UPDATE_SCHEMA = register_schema({
+    "first_name": {'type': 'string', 'required': True, 'empty': False},
+    "last_name": {'type': 'string', 'required': True, 'empty': False},
+    "gender": {'type': 'string', 'required': True, 'empty': False, 'allowed': ['male', 'female']},
+    "dob": {'type': 'date', 'required': True, 'empty': False},
+    "marital_status": {'type': 'string', 'required': True, 'empty': False,
+                       'allowed': ['single', 'married', 'separated']},
+    "country_code": {'type': 'integer', 'required': True, 'empty': False},
+    "ssn_itin": {'type': 'string', 'required': True, 'empty': True},
+    "mobile": {'type': 'string', 'required': True, 'empty': False},
+    "phone": {'type': 'string', 'required': True, 'empty': False},
+    "profile_type": {'type': 'string', 'required': True, 'empty': False,
+                     'allowed': ArgoCommonConstants.PROFILE_TYPES},
+    "company_name": {'type': 'string', 'required': True, 'empty': True},
+    "mailing_address": {'type': 'string', 'required': True, 'empty': False},
+    "mailing_country_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_state_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_city_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "mailing_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_address": {'type': 'string', 'required': True, 'empty': False},
+    "physical_country_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_state_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_city_id": {'type': 'integer', 'required': True, 'nullable': False},
+    "physical_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
+    "id_type": {'type': 'string', 'required': True, 'empty': False,
+                'allowed': ['license', 'passport', 'stateid', 'foreginid']},
+    "id_number": {'type': 'string', 'required': True, 'empty': False},
+    "id_country": {'type': 'integer', 'required': True, 'nullable': False},
+    "id_state": {'type': 'integer', 'required': True, 'nullable': True},
+    "id_expire_date": {'type': 'date', 'required': True, 'empty': False},
+    "id_status": {'type': 'string', 'required': True, 'empty': False,
+                  'allowed': ['valid', 'expired', 'suspended', 'revoked']}
+})
+
+NOTE_CREATE_SCHEMA = register_schema({
+    "user_id": {'type': 'integer', 'required': True, 'empty': False},
+    "user_note": {'type': 'string', 'required': True, 'empty': False},
+    "full_name": {'type':'string', 'required': True,'empty':False},
+    "role_id": {'type': 'integer', 'required': True, 'nullable': False},
+})
+
+NOTE_LIST_SCHEMA = register_schema({
+    # "search_keyword": {'type': 'string', 'required': True, 'empty': True},
+    "page_limit": {'type': 'integer', 'required': True, 'empty': False},
+    "page_offset": {'type': 'integer', 'required': True, 'empty': False}
+})
+
+NOTE_UPDATE_SCHEMA = register_schema({
+    "id": {'type': 'integer', 'required': True, 'empty': False},
+    "user_notes": {'type': 'string', 'required': True, 'empty': True}
+})
+
 
 # Create your views here.
 
 class Customers(APIView):
+    renderer_classes = RENDERER_CLASSES
 
     @method_decorator(isAuthenticate)
     @method_decorator(RbacService('customers:profile:read'))
@@ -68,18 +171,13 @@ class Customers(APIView):
         }
         """
         try:
-            schema = {
-                "search_keyword": {'type': 'string', 'required': True, 'empty': True},
-                "page_limit": {'type': 'integer', 'required': True, 'empty': False},
-                "page_offset": {'type': 'integer', 'required': True, 'empty': False}
-            }
             instance = {
                 "search_keyword": request.GET['search_keyword'],
                 "page_limit": int(request.GET['page_limit']),
                 "page_offset": int(request.GET['page_offset'])
             }
             v = Validator()
-            if not v.validate(instance, schema):
+            if not v.validate(instance, CUSTOMER_LIST_SCHEMA):
                 return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
 
             search_keyword = request.GET['search_keyword']
@@ -159,44 +257,10 @@ class Customers(APIView):
         }
         """
         try:
-            schema = {
-                "first_name": {'type': 'string', 'required': True, 'empty': False},
-                "last_name": {'type': 'string', 'required': True, 'empty': False},
-                "gender": {'type': 'string', 'required': True, 'empty': False, 'allowed': ArgoCommonConstants.GENDER},
-                "dob": {'type': 'date', 'required': True, 'empty': False},
-                "marital_status": {'type': 'string', 'required': True, 'empty': False,
-                                   'allowed': ArgoCommonConstants.MARTIAL_STATUS},
-                "country_code": {'type': 'integer', 'required': True, 'empty': False},
-                "ssn_itin": {'type': 'string', 'required': True, 'empty': True},
-                "mobile": {'type': 'string', 'required': True, 'empty': False},
-                "phone": {'type': 'string', 'required': True, 'empty': False},
-                "email": {'type': 'string', 'required': True, 'empty': False},
-                "profile_type": {'type': 'string', 'required': True, 'empty': False,
-                                 'allowed': ArgoCommonConstants.PROFILE_TYPES},
-                "company_name": {'type': 'string', 'required': True, 'empty': True},
-                "mailing_address": {'type': 'string', 'required': True, 'empty': False},
-                "mailing_country_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_state_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_city_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_address": {'type': 'string', 'required': True, 'empty': False},
-                "physical_country_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_state_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_city_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
-                "id_type": {'type': 'string', 'required': True, 'empty': False,
-                            'allowed': ArgoCommonConstants.ID_TYPE},
-                "id_number": {'type': 'string', 'required': True, 'empty': False},
-                "id_country": {'type': 'integer', 'required': True, 'nullable': False},
-                "id_state": {'type': 'integer', 'required': True, 'nullable': True},
-                "id_expire_date": {'type': 'date', 'required': True, 'empty': False},
-                "id_status": {'type': 'string', 'required': True, 'empty': False,
-                              'allowed': ArgoCommonConstants.ID_STATUS}
-            }
             request.data.update({'dob': datetime.strptime(request.data.get('dob'), '%Y-%m-%d')})
             request.data.update({'id_expire_date': datetime.strptime(request.data.get('id_expire_date'), '%Y-%m-%d')})
             v = Validator()
-            if not v.validate(request.data, schema):
+            if not v.validate(request.data, CUSTOMER_CREATE_SCHEMA):
                 return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
 
             if User.objects.filter(email=request.data.get('email').lower()).exists():
@@ -445,43 +509,10 @@ class CustomerDetail(APIView):
         }
         """
         try:
-            schema = {
-                "first_name": {'type': 'string', 'required': True, 'empty': False},
-                "last_name": {'type': 'string', 'required': True, 'empty': False},
-                "gender": {'type': 'string', 'required': True, 'empty': False, 'allowed': ['male', 'female']},
-                "dob": {'type': 'date', 'required': True, 'empty': False},
-                "marital_status": {'type': 'string', 'required': True, 'empty': False,
-                                   'allowed': ['single', 'married', 'separated']},
-                "country_code": {'type': 'integer', 'required': True, 'empty': False},
-                "ssn_itin": {'type': 'string', 'required': True, 'empty': True},
-                "mobile": {'type': 'string', 'required': True, 'empty': False},
-                "phone": {'type': 'string', 'required': True, 'empty': False},
-                "profile_type": {'type': 'string', 'required': True, 'empty': False,
-                                 'allowed': ArgoCommonConstants.PROFILE_TYPES},
-                "company_name": {'type': 'string', 'required': True, 'empty': True},
-                "mailing_address": {'type': 'string', 'required': True, 'empty': False},
-                "mailing_country_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_state_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_city_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "mailing_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_address": {'type': 'string', 'required': True, 'empty': False},
-                "physical_country_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_state_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_city_id": {'type': 'integer', 'required': True, 'nullable': False},
-                "physical_zip_code": {'type': 'integer', 'required': True, 'nullable': False},
-                "id_type": {'type': 'string', 'required': True, 'empty': False,
-                            'allowed': ['license', 'passport', 'stateid', 'foreginid']},
-                "id_number": {'type': 'string', 'required': True, 'empty': False},
-                "id_country": {'type': 'integer', 'required': True, 'nullable': False},
-                "id_state": {'type': 'integer', 'required': True, 'nullable': True},
-                "id_expire_date": {'type': 'date', 'required': True, 'empty': False},
-                "id_status": {'type': 'string', 'required': True, 'empty': False,
-                              'allowed': ['valid', 'expired', 'suspended', 'revoked']}
-            }
             request.data.update({'dob': datetime.strptime(request.data.get('dob'), '%Y-%m-%d')})
             request.data.update({'id_expire_date': datetime.strptime(request.data.get('id_expire_date'), '%Y-%m-%d')})
             v = Validator()
-            if not v.validate(request.data, schema):
+            if not v.validate(request.data, CUSTOMER_UPDATE_SCHEMA):
                 return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
             current_user_id = int(id)
             if (not User.objects.filter(user_id=current_user_id).exists() or
@@ -600,14 +631,8 @@ def create_note(request):
     """
     try:
         
-        schema = {
-            "user_id": {'type': 'integer', 'required': True, 'empty': False},
-            "user_note": {'type': 'string', 'required': True, 'empty': False},
-            "full_name": {'type':'string', 'required': True,'empty':False},
-            "role_id": {'type': 'integer', 'required': True, 'nullable': False},
-        }
         v = Validator()
-        if not v.validate(request.data, schema):
+        if not v.validate(request.data, NOTE_CREATE_SCHEMA):
             return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
 
         user_obj = User.objects.get(user_id=request.data.get('user_id'))
@@ -632,23 +657,19 @@ def create_note(request):
         return Response({'error': str(exception)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@renderer_classes(RENDERER_CLASSES)
 # @isAuthenticate
 # @RbacService('customers:profile:update')
 def notes_list(request):
     
     try:
-            schema = {
-                # "search_keyword": {'type': 'string', 'required': True, 'empty': True},
-                "page_limit": {'type': 'integer', 'required': True, 'empty': False},
-                "page_offset": {'type': 'integer', 'required': True, 'empty': False}
-            }
             instance = {
                 # "search_keyword": request.GET['search_keyword'],
                 "page_limit": int(request.GET['page_limit']),
                 "page_offset": int(request.GET['page_offset'])
             }
             v = Validator()
-            if not v.validate(instance, schema):
+            if not v.validate(instance, NOTE_LIST_SCHEMA):
                 return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
 
             # search_keyword = request.GET['search_keyword']
@@ -724,14 +745,10 @@ def update_note(request, id):
     """
     
     try:
-        schema = {
-            "id": {'type': 'integer', 'required': True, 'empty': False},
-            "user_notes": {'type': 'string', 'required': True, 'empty': True}
-                }
         print(request.data)
         
         v = Validator()
-        if not v.validate(request.data, schema):
+        if not v.validate(request.data, NOTE_UPDATE_SCHEMA):
             return Response({'error': v.errors}, status=status.HTTP_400_BAD_REQUEST)
         note_id = int(id)
         id_obj = Notes.objects.filter(id=note_id)
@@ -0,0 +1,12 @@
+import os
+import sys
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# outside the project (no DJANGO_SETTINGS_MODULE) run against bare settings
+if not settings.configured and 'DJANGO_SETTINGS_MODULE' not in os.environ:
+    settings.configure()
+    django.setup()
@@ -0,0 +1,152 @@
+import os
+import signal
+import types
+import unittest
+from unittest import mock
+
+from utility import errorLogger
+from utility.errorLogger import ErrorLogPipeline, RequestContextMiddleware
+
+
+def make_pipeline(**kwargs):
+    # no writer thread, the tests drain the queue with flush()
+    pipeline = ErrorLogPipeline(**kwargs)
+    pipeline._ensure_writer = lambda: None
+    return pipeline
+
+
+class ErrorLogPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.writes = []
+        patcher = mock.patch.object(errorLogger, 'write_error', lambda site, message: self.writes.append((site, message)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_errors_are_collapsed_with_full_count(self):
+        pipeline = make_pipeline(site_rate_limit=1)
+        for _ in range(200):
+            pipeline.submit('views/get', 'boom', None)
+        pipeline.flush()
+        self.assertEqual(self.writes, [('views/get', 'boom | count=200')])
+
+    def test_rate_limit_applies_to_distinct_errors_per_site(self):
+        pipeline = make_pipeline(site_rate_limit=2)
+        for i in range(5):
+            pipeline.submit('views/get', 'error %d' % i, None)
+        pipeline.submit('views/post', 'other site', None)
+        pipeline.flush()
+        self.assertEqual(self.writes, [
+            ('views/get', 'error 0'),
+            ('views/get', 'error 1'),
+            ('views/post', 'other site'),
+            ('views/get', 'rate limited, 3 distinct error(s) not logged'),
+        ])
+
+    def test_rate_limit_window_resets_after_a_second(self):
+        pipeline = make_pipeline(site_rate_limit=1)
+        with mock.patch.object(errorLogger.time, 'monotonic', return_value=100.0):
+            pipeline.submit('views/get', 'first', None)
+            pipeline.submit('views/get', 'limited', None)
+        with mock.patch.object(errorLogger.time, 'monotonic', return_value=101.0):
+            pipeline.submit('views/get', 'next window', None)
+        pipeline.flush()
+        self.assertIn(('views/get', 'next window'), self.writes)
+        self.assertIn(('views/get', 'rate limited, 1 distinct error(s) not logged'), self.writes)
+
+    def test_queue_overflow_is_reported_separately(self):
+        pipeline = make_pipeline(queue_size=1)
+        pipeline.submit('views/get', 'queued', None)
+        pipeline.submit('views/get', 'overflow', None)
+        pipeline.flush()
+        self.assertEqual(self.writes, [
+            ('views/get', 'queued'),
+            ('views/get', 'log queue full, 1 error(s) dropped'),
+        ])
+
+    def test_request_fields_are_merged_per_entry(self):
+        pipeline = make_pipeline()
+        pipeline.submit('views/get', 'boom', {'endpoint': 'GET /a', 'duration_ms': 12.0, 'queries': 3})
+        pipeline.submit('views/get', 'boom', {'endpoint': 'GET /b', 'duration_ms': 40.0, 'queries': 1})
+        pipeline.flush()
+        self.assertEqual(self.writes, [
+            ('views/get', 'boom | count=2 | endpoint=GET /a,GET /b | duration_ms=40.0 | queries=3'),
+        ])
+
+    def test_entry_is_queued_again_after_it_was_written(self):
+        pipeline = make_pipeline()
+        pipeline.submit('views/get', 'boom', None)
+        pipeline.flush()
+        pipeline.submit('views/get', 'boom', None)
+        pipeline.flush()
+        self.assertEqual(self.writes, [('views/get', 'boom'), ('views/get', 'boom')])
+
+    def test_broken_logger_service_is_reported_and_writer_continues(self):
+        pipeline = make_pipeline()
+        pipeline.submit('views/get', 'first', None)
+        pipeline.submit('views/get', 'second', None)
+        calls = []
+
+        def failing_write(site, message):
+            calls.append(message)
+            raise IOError('disk full')
+
+        with mock.patch.object(errorLogger, 'write_error', failing_write):
+            with self.assertLogs('utility.errorLogger', 'ERROR') as logs:
+                pipeline.flush()
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn('views/get: first', logs.output[0])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_child_starts_with_fresh_state_after_fork(self):
+        pipeline = make_pipeline()
+        pipeline.submit('views/get', 'parent entry', None)
+        pipeline._lock.acquire()
+        pid = os.fork()
+        if pid == 0:
+            # a deadlock on the inherited lock would hang here, SIGALRM ends it
+            signal.alarm(5)
+            status = 1
+            try:
+                pipeline.submit('views/get', 'child entry', None)
+                pipeline.flush()
+                if self.writes == [('views/get', 'child entry')]:
+                    status = 0
+            finally:
+                os._exit(status)
+        pipeline._lock.release()
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        pipeline.flush()
+        self.assertEqual(self.writes, [('views/get', 'parent entry')])
+
+
+class RequestContextMiddlewareTest(unittest.TestCase):
+
+    def test_logerror_captures_endpoint_duration_and_queries(self):
+        pipeline = mock.Mock()
+
+        def view(request):
+            execute = mock.Mock()
+            errorLogger._count_queries(execute, 'SELECT 1', None, False, {})
+            errorLogger._count_queries(execute, 'SELECT 2', None, False, {})
+            errorLogger.logerror('views/get', 'boom')
+            return 'response'
+
+        request = types.SimpleNamespace(method='GET', path='/v1/admin/customers')
+        with mock.patch.object(errorLogger, 'pipeline', pipeline):
+            response = RequestContextMiddleware(view)(request)
+
+        self.assertEqual(response, 'response')
+        site, message, fields = pipeline.submit.call_args[0]
+        self.assertEqual((site, message), ('views/get', 'boom'))
+        self.assertEqual(fields['endpoint'], 'GET /v1/admin/customers')
+        self.assertEqual(fields['queries'], 2)
+        self.assertGreaterEqual(fields['duration_ms'], 0)
+
+    def test_logerror_outside_a_request_has_no_fields(self):
+        pipeline = mock.Mock()
+        with mock.patch.object(errorLogger, 'pipeline', pipeline):
+            errorLogger.logerror('cron/job', 'boom')
+        pipeline.submit.assert_called_once_with('cron/job', 'boom', None)
@@ -0,0 +1,100 @@
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# only textual/binary payloads that actually shrink are worth compressing
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack', 'text/')
+
+
+def accepted_encodings(header):
+    """
+    Parse an Accept-Encoding header into {coding: q}. Codings with q=0 are
+    refused and left out; `*` stands for any coding not listed explicitly.
+    """
+    qvalues = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+
+    wildcard = qvalues.pop('*', 0.0)
+    accepted = {coding: q for coding, q in qvalues.items() if q > 0}
+    if wildcard > 0:
+        for coding in ('br', 'gzip'):
+            if coding not in qvalues:
+                accepted[coding] = wildcard
+    return accepted
+
+
+class ResponseCompressionMiddleware(MiddlewareMixin):
+    """
+    Compress rendered responses with brotli (when installed) or gzip,
+    based on the request's Accept-Encoding header.
+
+    Responses smaller than settings.RESPONSE_COMPRESSION_MIN_SIZE bytes
+    (default 1024) are sent as is, since the compression overhead outweighs
+    the saving on small payloads. Add to MIDDLEWARE in place of Django's
+    GZipMiddleware.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if response.status_code != 200:
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        min_size = getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+        if len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None:
+            accepted.pop('br', None)
+        # highest q wins, brotli on a tie since it compresses JSON better
+        encoding = max(('br', 'gzip'), key=lambda coding: (accepted.get(coding, 0), coding == 'br'))
+        if encoding not in accepted:
+            return response
+        if encoding == 'br':
+            compressed = brotli.compress(
+                response.content,
+                quality=getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 5)
+            )
+        else:
+            compressed = gzip.compress(
+                response.content,
+                compresslevel=getattr(settings, 'RESPONSE_COMPRESSION_GZIP_LEVEL', 6)
+            )
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            # strong ETags no longer match the compressed body
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,201 @@
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from utility.loggerService import logerror as write_error
+
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = getattr(settings, 'ERROR_LOG_QUEUE_SIZE', 10000)
+FLUSH_INTERVAL = getattr(settings, 'ERROR_LOG_FLUSH_INTERVAL', 1.0)
+BATCH_SIZE = getattr(settings, 'ERROR_LOG_BATCH_SIZE', 500)
+# max distinct errors accepted per call site per second, the rest are only counted
+SITE_RATE_LIMIT = getattr(settings, 'ERROR_LOG_SITE_RATE_LIMIT', 50)
+
+_request_context = contextvars.ContextVar('error_log_request_context', default=None)
+
+
+class RequestContextMiddleware:
+    """
+    Records endpoint, start time and query count of the current request so
+    that logerror() can attach them to error entries without the views
+    having to pass them in. Add to MIDDLEWARE before the DRF views run.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        context = {'endpoint': request.method + ' ' + request.path, 'started_at': time.monotonic(), 'queries': 0}
+        token = _request_context.set(context)
+        try:
+            with connection.execute_wrapper(_count_queries):
+                return self.get_response(request)
+        finally:
+            _request_context.reset(token)
+
+
+def _count_queries(execute, sql, params, many, context):
+    request_context = _request_context.get()
+    if request_context is not None:
+        request_context['queries'] += 1
+    return execute(sql, params, many, context)
+
+
+class ErrorLogPipeline:
+    """
+    Bounded in-memory queue drained by a background writer thread.
+
+    Identical (site, message) pairs are collapsed on the request thread: the
+    first occurrence is queued, later ones only bump the pending entry's
+    count until the writer picks it up. The per-site rate limit applies to
+    distinct entries only, so a storm of one repeated error keeps its full
+    count. The request thread never waits on loggerService.
+    """
+
+    def __init__(self, queue_size=QUEUE_SIZE, flush_interval=FLUSH_INTERVAL,
+                 batch_size=BATCH_SIZE, site_rate_limit=SITE_RATE_LIMIT):
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.site_rate_limit = site_rate_limit
+        self._reset()
+        # the writer thread doesn't survive fork and the lock may have been
+        # held by it at fork time, so each child starts from a clean state
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._windows = {}
+        self._rate_limited = {}
+        self._overflowed = {}
+        self._thread = None
+
+    def submit(self, site, message, fields):
+        key = (site, message)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                _merge_fields(entry, fields)
+                return
+            window_start, accepted = self._windows.get(site, (now, 0))
+            if now - window_start >= 1.0:
+                window_start, accepted = now, 0
+            if accepted >= self.site_rate_limit:
+                self._rate_limited[site] = self._rate_limited.get(site, 0) + 1
+                return
+            self._windows[site] = (window_start, accepted + 1)
+            entry = self._pending[key] = {'count': 0, 'endpoints': set(), 'duration_ms': None, 'queries': None}
+            _merge_fields(entry, fields)
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(key)
+        except queue.Full:
+            with self._lock:
+                entry = self._pending.pop(key)
+                self._overflowed[site] = self._overflowed.get(site, 0) + entry['count']
+
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(batch)
+
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='error-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        with self._lock:
+            entries = [(key, self._pending.pop(key)) for key in batch]
+            rate_limited, self._rate_limited = self._rate_limited, {}
+            overflowed, self._overflowed = self._overflowed, {}
+
+        for (site, message), entry in entries:
+            _write_safely(site, _format_entry(message, entry))
+        for site, count in rate_limited.items():
+            _write_safely(site, 'rate limited, %d distinct error(s) not logged' % count)
+        for site, count in overflowed.items():
+            _write_safely(site, 'log queue full, %d error(s) dropped' % count)
+
+
+def _merge_fields(entry, fields):
+    entry['count'] += 1
+    if fields:
+        entry['endpoints'].add(fields['endpoint'])
+        entry['duration_ms'] = max(entry['duration_ms'] or 0, fields['duration_ms'])
+        entry['queries'] = max(entry['queries'] or 0, fields['queries'])
+
+
+def _write_safely(site, message):
+    try:
+        write_error(site, message)
+    except Exception:
+        # the writer thread must survive a broken loggerService, but the
+        # entry shouldn't vanish without a trace either
+        logger.exception('loggerService failed, error log entry lost: %s: %s', site, message)
+
+
+def _format_entry(message, entry):
+    parts = [message]
+    if entry['count'] > 1:
+        parts.append('count=%d' % entry['count'])
+    if entry['endpoints']:
+        parts.append('endpoint=%s' % ','.join(sorted(entry['endpoints'])))
+        parts.append('duration_ms=%.1f' % entry['duration_ms'])
+        parts.append('queries=%d' % entry['queries'])
+    return ' | '.join(parts)
+
+
+pipeline = ErrorLogPipeline()
+atexit.register(pipeline.flush)
+
+
+def logerror(site, message):
+    """
+    Non-blocking drop-in for loggerService.logerror. Entries are written in
+    batches by a background thread, with request fields attached when
+    RequestContextMiddleware is installed.
+    """
+    context = _request_context.get()
+    fields = None
+    if context is not None:
+        fields = {
+            'endpoint': context['endpoint'],
+            'duration_ms': (time.monotonic() - context['started_at']) * 1000,
+            'queries': context['queries'],
+        }
+    pipeline.submit(site, message, fields)
@@ -0,0 +1,65 @@
+import cProfile
+import itertools
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+
+PROFILE_HEADER = 'HTTP_X_LOAD_TEST_PROFILE'
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles a sample of the requests sent with an `X-Load-Test-Profile`
+    header and keeps a cProfile dump for those slower than
+    settings.REQUEST_PROFILE_MIN_MS. The dump path is returned in the
+    `X-Profile-File` response header.
+
+    Only one request is profiled at a time: since Python 3.12 cProfile is
+    process-wide and a second profiler fails to enable, so overlapping
+    requests pass through unprofiled. settings.REQUEST_PROFILE_SAMPLE_EVERY
+    (default 10) profiles one flagged request in N to keep the profiling
+    overhead out of most of the measured latencies.
+
+    Only active when settings.REQUEST_PROFILE_DIR is set, meant for local
+    load-test runs (see benchmarks/loadTest.py), never for production.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.profile_dir = getattr(settings, 'REQUEST_PROFILE_DIR', None)
+        self.min_ms = getattr(settings, 'REQUEST_PROFILE_MIN_MS', 500)
+        self.sample_every = max(1, getattr(settings, 'REQUEST_PROFILE_SAMPLE_EVERY', 10))
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+
+    def __call__(self, request):
+        if not self.profile_dir or PROFILE_HEADER not in request.META:
+            return self.get_response(request)
+        if next(self._counter) % self.sample_every:
+            return self.get_response(request)
+        if not self._lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            started_at = time.monotonic()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration_ms = (time.monotonic() - started_at) * 1000
+            if duration_ms >= self.min_ms:
+                name = '%s-%d-%s.prof' % (request.method.lower(), int(duration_ms), uuid.uuid4().hex[:8])
+                path = os.path.join(self.profile_dir, name)
+                profiler.dump_stats(path)
+                response['X-Profile-File'] = path
+            return response
+        finally:
+            self._lock.release()
@@ -0,0 +1,74 @@
+from rest_framework import renderers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# DRF's encoder already knows how to handle Decimal, lazy strings, querysets etc.
+# orjson and msgpack only fall back to it for types they can't serialize natively.
+_fallback_default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+    datetime, date, time and UUID values are serialized natively, in the same
+    format as DRF's JSONEncoder (full microseconds, `Z` for UTC); anything
+    else goes through DRF's JSONEncoder. Falls back to the stock renderer
+    when orjson is not installed or when the browsable API asks for indentation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=_fallback_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renders responses as MessagePack for clients sending
+    `Accept: application/msgpack` (or `?format=msgpack`).
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # msgpack has no native datetime/UUID support, so mirror the JSON output
+        return msgpack.packb(data, default=_fallback_default, use_bin_type=True)
+
+
+def _renderer_classes():
+    # follow the project's DEFAULT_RENDERER_CLASSES, only swapping in the
+    # faster JSON renderer and offering msgpack when it is installed
+    classes = tuple(
+        FastJSONRenderer if renderer_class is renderers.JSONRenderer else renderer_class
+        for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+    )
+    if msgpack is not None:
+        classes += (MessagePackRenderer,)
+    return classes
+
+
+# renderer list for the list/export endpoints
+RENDERER_CLASSES = _renderer_classes()
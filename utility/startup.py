@@ -0,0 +1,133 @@
+import importlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+_lazy_imports = []
+_schemas = []
+_serializers = []
+_warmup_hooks = []
+
+
+class LazyImport:
+    """
+    Stand-in for `from module import name` that imports on first use.
+    Calling the proxy or reading an attribute loads the real object.
+    """
+
+    def __init__(self, module_path, name):
+        self._module_path = module_path
+        self._name = name
+        self._target = None
+        self._lock = threading.Lock()
+        _lazy_imports.append(self)
+
+    def load(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_path)
+                    self._target = getattr(module, self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.load(), item)
+
+    def __repr__(self):
+        return '<LazyImport %s.%s>' % (self._module_path, self._name)
+
+
+def lazy_import(module_path, name):
+    return LazyImport(module_path, name)
+
+
+def register_schema(schema):
+    """Register a Cerberus schema to be compiled during warm-up."""
+    _schemas.append(schema)
+    return schema
+
+
+def register_serializer(serializer_class):
+    """
+    Register a DRF serializer class to instantiate during warm-up. DRF builds
+    fields per instance, so this doesn't save the field building of later
+    requests; it loads the field modules and fills the model _meta caches.
+    """
+    _serializers.append(serializer_class)
+    return serializer_class
+
+
+def register_warmup(func):
+    """Register a callable (e.g. loading a reference cache) run during warm-up."""
+    _warmup_hooks.append(func)
+    return func
+
+
+def warm_up(connect_db=True):
+    """
+    Resolve lazy imports, compile validator schemas, instantiate registered
+    serializers, run registered hooks and open persistent DB connections.
+    Failures are logged and skipped, a failed warm-up must never stop the
+    worker from serving. Returns the time spent per step in milliseconds.
+    """
+    timings = {}
+
+    def step(name, func):
+        started_at = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            logger.exception('warm-up step %s failed', name)
+        timings[name] = (time.perf_counter() - started_at) * 1000
+
+    step('imports', lambda: [lazy.load() for lazy in _lazy_imports])
+
+    def compile_schemas():
+        from cerberus import Validator
+        for schema in _schemas:
+            # Cerberus caches schemas it has already validated, so later
+            # Validator().validate(doc, schema) calls skip this work
+            Validator(schema)
+    step('validators', compile_schemas)
+    step('serializers', lambda: [serializer_class().fields for serializer_class in _serializers])
+    for hook in _warmup_hooks:
+        step(hook.__name__, hook)
+    if connect_db:
+        step('db', _connect_persistent)
+    return timings
+
+
+def _connect_persistent():
+    # Django closes connections with CONN_MAX_AGE=0 at request_started, and
+    # connections are per thread, so this only helps sync workers that keep
+    # persistent connections (post_worker_init skips it for other workers)
+    for alias in connections:
+        connection = connections[alias]
+        if connection.settings_dict.get('CONN_MAX_AGE', 0):
+            connection.ensure_connection()
+
+
+def post_worker_init(worker):
+    """
+    Gunicorn hook, runs in each worker after the app is loaded. Enable with
+    `from utility.startup import post_worker_init` in gunicorn.conf.py and
+    WARMUP_ON_WORKER_INIT = True in settings.
+
+    DB connections are only opened on sync workers: on gthread/gevent
+    workers requests run in other threads or greenlets, so a connection
+    opened here would never be used and, with CONN_MAX_AGE, never closed.
+    """
+    if not getattr(settings, 'WARMUP_ON_WORKER_INIT', False):
+        return
+    from gunicorn.workers.sync import SyncWorker
+    timings = warm_up(connect_db=isinstance(worker, SyncWorker))
+    worker.log.info('worker warm-up done: %s', ', '.join('%s=%.1fms' % item for item in timings.items()))